@@ -1,12 +1,29 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import asyncio
 import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
 from typing import Optional
 
-try:
-    from bleak import BleakClient, BleakScanner
-except Exception as e:
-    raise SystemExit("Please install bleak: pip install bleak")
+# bleak is imported lazily: pulling in the backend (dbus_fast/pyobjc/WinRT)
+# costs 100-500 ms, which --help and argument errors shouldn't pay for.
+BleakClient = None
+BleakScanner = None
+
+def _import_bleak():
+    global BleakClient, BleakScanner
+    if BleakClient is None:
+        try:
+            from bleak import BleakClient as _client, BleakScanner as _scanner
+        except Exception:
+            raise SystemExit("Please install bleak: pip install bleak")
+        BleakClient, BleakScanner = _client, _scanner
 
 # UUID template used in the original app: 0000%s-0000-1000-8000-00805f9b34fb
 UUID_TEMPLATE = "0000%s-0000-1000-8000-00805f9b34fb"
@@ -40,124 +57,432 @@ DEVICE_UUIDS = {
     "KS15~": {"service": "AFD0", "write": "AFD3"},
 }
 
-# Command builders based on CmdFloor.getTopOn(Z):
+# Normalize short UUIDs to uppercase once at load so nothing downstream
+# ever needs a runtime .upper() before comparing or formatting them.
+DEVICE_UUIDS = {
+    prefix: {key: value.upper() for key, value in entry.items()}
+    for prefix, entry in DEVICE_UUIDS.items()
+}
+
+# Compiled once: classifies a KS03 device name and yields the DEVICE_UUIDS
+# key in a single match, instead of one startswith() call per known prefix
+# for every advertisement seen during a scan.
+_KS03_RE = re.compile("^(" + "|".join(re.escape(k) for k in DEVICE_UUIDS if k.startswith("KS03")) + ")")
+
+# Full-UUID lookup for every short UUID we know about (incl. the AFD3/FFF3
+# fallback pair, which only appears in the write fallback path)
+_UUID_BY_SHORT = {
+    short: UUID_TEMPLATE % short
+    for entry in DEVICE_UUIDS.values()
+    for short in entry.values()
+}
+_UUID_BY_SHORT.setdefault("AFD3", UUID_TEMPLATE % "AFD3")
+_UUID_BY_SHORT.setdefault("FFF3", UUID_TEMPLATE % "FFF3")
+
+def _full_uuid(short: str) -> str:
+    return _UUID_BY_SHORT.get(short) or (UUID_TEMPLATE % short)
+
+# Some KS03 firmwares expose the classic FFF3 write char alongside AFD3;
+# map each to its alternate for the last-resort fallback in write_command.
+_ALT_UUID = {
+    UUID_TEMPLATE % "AFD3": UUID_TEMPLATE % "FFF3",
+    UUID_TEMPLATE % "FFF3": UUID_TEMPLATE % "AFD3",
+}
+
+# Notify characteristics per service, used to wait for a command ack
+# instead of sleeping a fixed interval after each write.
+_NOTIFY_UUIDS = {
+    UUID_TEMPLATE % "AFD0": UUID_TEMPLATE % "AFD2",  # AFD2 = notify
+}
+
+# Command payloads based on CmdFloor.getTopOn(Z):
 # On:  "5B" + "F0" + "01B5"
 # Off: "5B" + "0F" + "01B5"
 # Many fragments use this for top/strip toggles. You may need other Cmd* for specific models,
 # but this is a good starting point observed across UI toggles.
+_CMD_ON = bytes.fromhex("5BF001B5")
+_CMD_OFF = bytes.fromhex("5B0F01B5")
 
 def build_on_off_cmd(is_on: bool) -> bytes:
-    hex_str = ("5B" + ("F0" if is_on else "0F") + "01B5")
-    return bytes.fromhex(hex_str)
+    return _CMD_ON if is_on else _CMD_OFF
 
-async def find_device_by_prefix(prefix: str, timeout: float = 8.0) -> Optional[str]:
-    devices = await BleakScanner.discover(timeout=timeout)
-    for d in devices:
+async def find_device_by_prefix(prefix: str, service_short: str, timeout: float = 8.0) -> Optional[str]:
+    _import_bleak()
+    # Callback-driven scan that stops on the first matching advertisement, so
+    # average scan time is one advertising interval (typically 100-500 ms)
+    # rather than the full timeout. Filtering on the advertised service UUID
+    # lets the OS BLE stack drop unrelated devices before they ever reach
+    # Python (also required on macOS 12.0-12.3).
+    stop = asyncio.Event()
+    found = {}
+
+    def _on_detect(d, _adv):
         if d.name and d.name.startswith(prefix):
-            return d.address
-    return None
+            found["device"] = d
+            stop.set()
+
+    async with BleakScanner(detection_callback=_on_detect, service_uuids=[UUID_TEMPLATE % service_short]):
+        try:
+            await asyncio.wait_for(stop.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+    return found["device"].address
+
+async def find_and_connect_by_prefix(prefix: str, service_short: str, timeout: float = 8.0) -> Optional[BleakClient]:
+    """Scan for prefix and start connecting the moment it advertises.
+
+    The connection handshake overlaps the tail of the scan instead of running
+    after it, collapsing the scan-then-connect serialization. Returns a
+    connected client (registered in the client cache so write_command picks
+    it up), or None if nothing matched within timeout.
+    """
+    _import_bleak()
+    stop = asyncio.Event()
+    state = {}
+
+    def _on_detect(d, _adv):
+        if stop.is_set():
+            # Scan already concluded (match or timeout); a connect spawned
+            # now would never be awaited or torn down
+            return
+        if "task" not in state and d.name and d.name.startswith(prefix):
+            client = BleakClient(d)
+            state["client"] = client
+            state["task"] = asyncio.ensure_future(client.connect())
+            stop.set()
+
+    async with BleakScanner(detection_callback=_on_detect, service_uuids=[UUID_TEMPLATE % service_short]):
+        try:
+            await asyncio.wait_for(stop.wait(), timeout)
+        except asyncio.TimeoutError:
+            # Refuse late callbacks, then tear down a connect that may have
+            # raced in between the timeout and the scanner shutdown
+            stop.set()
+            task = state.get("task")
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+                try:
+                    await state["client"].disconnect()
+                except Exception:
+                    pass
+            return None
+
+    client = state["client"]
+    try:
+        async with asyncio.timeout(_CONNECT_TIMEOUT):
+            await state["task"]
+    except TimeoutError:
+        state["task"].cancel()
+        raise ConnectTimeoutError(f"Connection to {client.address} timed out after {_CONNECT_TIMEOUT:.0f}s")
+    if not client.is_connected:
+        raise RuntimeError("Failed to connect to device")
+    await _request_low_latency(client)
+    _CLIENT_CACHE[client.address] = (client, time.monotonic())
+    return client
 
 async def find_all_ks03(timeout: float = 8.0):
-    devices = await BleakScanner.discover(timeout=timeout)
-    results = []
-    for d in devices:
-        if d.name and (d.name.startswith("KS03-") or d.name.startswith("KS03~")):
-            results.append((d.address, d.name))
-    return results
-
-async def write_command(address: str, service_short: str, char_short: str, payload: bytes, verbose=False):
-    service_uuid = UUID_TEMPLATE % service_short
-    char_uuid = UUID_TEMPLATE % char_short
-    
-    client = BleakClient(address)
+    # Collect matches via detection callback (deduped by address) rather than
+    # post-filtering a full discover() result. KS03- advertises FFF0 and
+    # KS03~ advertises AFD0, so scan on the union of both service UUIDs.
+    # Returns (BLEDevice, prefix) pairs: keeping the BLEDevice lets connects
+    # skip the hidden re-scan some backends do to resolve a bare address,
+    # and the prefix is the matched DEVICE_UUIDS key.
+    _import_bleak()
+    found = {}
+    service_uuids = [UUID_TEMPLATE % "FFF0", UUID_TEMPLATE % "AFD0"]
+
+    def _on_detect(d, _adv):
+        m = _KS03_RE.match(d.name or "")
+        if m:
+            found[d.address] = (d, m.group(1))
+
+    async with BleakScanner(detection_callback=_on_detect, service_uuids=service_uuids):
+        await asyncio.sleep(timeout)
+    return list(found.values())
+
+# Last-known address per prefix plus resolved ATT write handles, persisted
+# across invocations so repeat runs can skip scanning (and UUID-to-handle
+# resolution) entirely. Entries older than a day are ignored.
+_ADDRESS_CACHE_FILE = Path.home() / ".cache" / "ks-led" / "addresses.json"
+_ADDRESS_CACHE_MAX_AGE = 24 * 3600.0
+
+# In-memory mirror of the "handles" section, keyed "address/char_uuid"
+_HANDLE_CACHE = None
+
+def _load_cache() -> dict:
+    """Return the cache ({"addresses": {...}, "handles": {...}}), or {} if missing/stale."""
     try:
-        await client.connect()
-        if not client.is_connected:
-            raise RuntimeError("Failed to connect to device")
-        
-        # Small settle delay after connecting
-        await asyncio.sleep(0.3)
-        
-        if verbose:
-            print(f"Connected to {address}")
-            print(f"Target service: {service_uuid}, char: {char_uuid}")
-            print(f"Payload: {payload.hex().upper()}")
-            # List available services and characteristics
-            for service in client.services:
-                if service_short.upper() in str(service.uuid).upper():
-                    print(f"  Found service: {service.uuid}")
-                    for char in service.characteristics:
-                        print(f"    Char: {char.uuid}, props: {char.properties}")
-        
-        # Some stacks ignore service when writing characteristic by UUID; Bleak uses characteristic UUID
-        # Many KS devices do not permit 'Write With Response'. Try without response first.
-        write_success = False
-        last_error = None
-        try:
-            await client.write_gatt_char(char_uuid, payload, response=False)
-            write_success = True
-            if verbose:
-                print(f"  ✓ Wrote to {char_uuid} (no response)")
-        except Exception as e1:
-            last_error = e1
-            if verbose:
-                print(f"  ✗ Write without response failed: {e1}")
-            try:
-                # Fallback to write with response if supported
-                await client.write_gatt_char(char_uuid, payload, response=True)
-                write_success = True
-                if verbose:
-                    print(f"  ✓ Wrote to {char_uuid} (with response)")
-            except Exception as e2:
-                last_error = e2
-                if verbose:
-                    print(f"  ✗ Write with response failed: {e2}")
-                # Last resort: for KS03 variants, some firmwares expose classic FFF3 alongside AFD3.
-                # Try alternate write characteristic if primary fails.
-                alt_char_short = None
-                if char_short.upper() == "AFD3":
-                    alt_char_short = "FFF3"
-                elif char_short.upper() == "FFF3":
-                    alt_char_short = "AFD3"
-                if alt_char_short:
-                    alt_char_uuid = UUID_TEMPLATE % alt_char_short
-                    try:
-                        await client.write_gatt_char(alt_char_uuid, payload, response=False)
-                        write_success = True
-                        if verbose:
-                            print(f"  ✓ Wrote to alternate {alt_char_uuid} (no response)")
-                    except Exception:
-                        try:
-                            await client.write_gatt_char(alt_char_uuid, payload, response=True)
-                            write_success = True
-                            if verbose:
-                                print(f"  ✓ Wrote to alternate {alt_char_uuid} (with response)")
-                        except Exception as e3:
-                            raise RuntimeError(f"All write attempts failed: {e1}, {e2}, {e3}")
-                else:
-                    raise RuntimeError(f"Write failed: {e1}, {e2}")
-        
-        # Give device time to process command before disconnecting
-        if write_success:
-            await asyncio.sleep(0.2)
-        else:
-            raise RuntimeError(f"Write failed: {last_error}")
-    finally:
+        if time.time() - _ADDRESS_CACHE_FILE.stat().st_mtime > _ADDRESS_CACHE_MAX_AGE:
+            return {}
+        with open(_ADDRESS_CACHE_FILE) as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    if "addresses" not in data:
+        data = {"addresses": data}  # Pre-handle-cache flat {prefix: address} layout
+    return data
+
+def _write_cache(data: dict):
+    try:
+        _ADDRESS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(_ADDRESS_CACHE_FILE, "w") as f:
+            json.dump(data, f, indent=2)
+    except Exception:
+        pass  # Cache is best-effort
+
+def _save_cache(prefix: str, address: str):
+    """Remember the address a scan resolved for prefix."""
+    data = _load_cache()
+    data.setdefault("addresses", {})[prefix] = address
+    _write_cache(data)
+
+def _cached_handle(address: str, char_uuid: str) -> Optional[int]:
+    global _HANDLE_CACHE
+    if _HANDLE_CACHE is None:
+        _HANDLE_CACHE = _load_cache().get("handles", {})
+    return _HANDLE_CACHE.get(f"{address}/{char_uuid}")
+
+def _save_handle(address: str, char_uuid: str, handle: Optional[int]):
+    """Remember (or forget, if handle is None) a resolved ATT write handle."""
+    global _HANDLE_CACHE
+    data = _load_cache()
+    handles = data.setdefault("handles", {})
+    key = f"{address}/{char_uuid}"
+    if handle is None:
+        handles.pop(key, None)
+    else:
+        handles[key] = handle
+    _HANDLE_CACHE = handles
+    _write_cache(data)
+
+# Recently connected clients, kept open so repeated commands to the same
+# device skip the 1.5-2.5s connection setup. Keyed by address.
+_CLIENT_CACHE = {}
+_CLIENT_CACHE_TTL = 30.0
+
+# Bail out well before the backend default (30s on BlueZ) when an address
+# is stale, so callers can fall back to scanning quickly.
+_CONNECT_TIMEOUT = 5.0
+
+class ConnectTimeoutError(RuntimeError):
+    """Device did not accept a connection within _CONNECT_TIMEOUT."""
+
+async def _get_client(device) -> BleakClient:
+    """Return a connected client, reusing a recent connection.
+
+    Accepts a BLEDevice (preferred: backends can connect to it directly,
+    with no hidden re-scan to resolve the peripheral) or an address string.
+    """
+    _import_bleak()
+    address = getattr(device, "address", device)
+    entry = _CLIENT_CACHE.get(address)
+    if entry is not None:
+        client, connected_at = entry
+        if client.is_connected and time.monotonic() - connected_at < _CLIENT_CACHE_TTL:
+            return client
+        _CLIENT_CACHE.pop(address, None)
+
+    client = BleakClient(device)
+    try:
+        async with asyncio.timeout(_CONNECT_TIMEOUT):
+            await client.connect()
+    except TimeoutError:
+        raise ConnectTimeoutError(f"Connection to {address} timed out after {_CONNECT_TIMEOUT:.0f}s")
+    if not client.is_connected:
+        raise RuntimeError("Failed to connect to device")
+
+    # No settle delay needed: Bleak's connect() already awaits GATT database
+    # readiness on all backends.
+    await _request_low_latency(client)
+    _CLIENT_CACHE[address] = (client, time.monotonic())
+    return client
+
+async def _request_low_latency(client: BleakClient) -> None:
+    """Best-effort request for faster link parameters after connecting.
+
+    Bleak exposes no portable API for connection-interval tuning, so poke
+    the backend where a knob exists and silently skip elsewhere. Getting
+    MTU negotiation out of the way up front means the first write is not
+    delayed by an ATT exchange, and a shorter connection interval lets the
+    write complete in one or two connection events.
+    """
+    backend = getattr(client, "_backend", None)
+    if backend is None:
+        return
+    try:
+        # BlueZ: trigger early MTU negotiation (acquire-write) now rather
+        # than lazily on the first write_gatt_char call.
+        acquire_mtu = getattr(backend, "_acquire_mtu", None)
+        if acquire_mtu is not None:
+            await acquire_mtu()
+    except Exception:
+        pass  # Purely an optimization; never fail the command over it
+
+async def close_cached_clients():
+    """Disconnect and drop all cached clients. Call once before exiting."""
+    for client, _ in _CLIENT_CACHE.values():
         try:
             if client.is_connected:
                 await client.disconnect()
         except Exception:
             pass  # Ignore disconnect errors
+    _CLIENT_CACHE.clear()
+
+class KSSession:
+    """Single-connection write session for one device.
+
+    Holds one connected client so callers can fire multiple payloads
+    back-to-back on the same ACL connection instead of paying connection
+    setup per command:
+
+        async with KSSession(addr, mapping["service"], mapping["write"]) as s:
+            await s.write(build_on_off_cmd(True))
+
+    Connections come from the module client cache and stay open on exit;
+    close_cached_clients() tears them down once before the process ends.
+    """
+
+    def __init__(self, device, service_short: str, char_short: str, verbose=False, client: Optional[BleakClient] = None):
+        # device may be a BLEDevice (preferred) or a bare address string
+        self.device = device
+        self.address = getattr(device, "address", device)
+        self.service_uuid = _full_uuid(service_short)
+        self.char_uuid = _full_uuid(char_short)
+        self.verbose = verbose
+        self.client = client
+
+    async def __aenter__(self):
+        if self.client is None:
+            self.client = await _get_client(self.device)
+        return self
+
+    async def __aexit__(self, *exc):
+        # The client cache owns the connection; nothing to tear down here
+        return False
+
+    async def write(self, payload: bytes):
+        client = self.client
+        char_uuid = self.char_uuid
+
+        # bytes/bytearray payloads (incl. the shared _CMD_ON/_CMD_OFF objects)
+        # pass through untouched; wrap anything else in a memoryview so Bleak
+        # doesn't have to copy it into a fresh bytes() on some backends.
+        if not isinstance(payload, (bytes, bytearray)):
+            payload = memoryview(payload)
+
+        if self.verbose:
+            print(f"Connected to {self.address}")
+            print(f"Target service: {self.service_uuid}, char: {char_uuid}")
+            print(f"Payload: {payload.hex().upper()}")
+            # Direct O(1) lookup instead of walking every discovered service
+            svc = client.services.get_service(self.service_uuid)
+            if svc:
+                print(f"  Found service: {svc.uuid}")
+                ch = svc.get_characteristic(char_uuid)
+                if ch:
+                    print(f"    Char: {ch.uuid}, props: {ch.properties}")
+
+        # Prefer waiting for the device's notification over a blind post-write
+        # sleep; models without a notify characteristic get a short grace period.
+        notify_uuid = _NOTIFY_UUIDS.get(self.service_uuid)
+        ack_event = None
+        if notify_uuid:
+            ack_event = asyncio.Event()
+            try:
+                await client.start_notify(notify_uuid, lambda _char, _data: ack_event.set())
+            except Exception:
+                ack_event = None  # Not all firmwares actually expose the notify char
+
+        # A handle cached from a previous run lets Bleak skip UUID-to-handle
+        # resolution entirely; a stale handle falls through to the UUID path.
+        wrote = False
+        handle = _cached_handle(self.address, char_uuid)
+        if handle is not None:
+            try:
+                await client.write_gatt_char(handle, payload, response=False)
+                wrote = True
+                if self.verbose:
+                    print(f"  ✓ Wrote to cached handle {handle} (no response)")
+            except Exception:
+                _save_handle(self.address, char_uuid, None)
+
+        if not wrote:
+            # Some stacks ignore service when writing characteristic by UUID; Bleak uses characteristic UUID.
+            # Inspect the characteristic's properties once and pick the supported write
+            # mode directly, instead of probing with sequential failed writes.
+            ch = client.services.get_characteristic(char_uuid)
+            if ch is None:
+                # For KS03 variants, some firmwares expose classic FFF3 alongside AFD3.
+                # Fall back to the alternate write characteristic if the primary is missing.
+                alt_char_uuid = _ALT_UUID.get(char_uuid)
+                ch = client.services.get_characteristic(alt_char_uuid) if alt_char_uuid else None
+                if ch is None:
+                    raise RuntimeError(f"Write characteristic {char_uuid} not found on device")
+                char_uuid = self.char_uuid = alt_char_uuid
+                if self.verbose:
+                    print(f"  Using alternate characteristic {char_uuid}")
+
+            # Many KS devices do not permit 'Write With Response'; prefer without.
+            use_response = "write" in ch.properties and "write-without-response" not in ch.properties
+            await client.write_gatt_char(char_uuid, payload, response=use_response)
+            _save_handle(self.address, char_uuid, ch.handle)
+            if self.verbose:
+                mode = "with response" if use_response else "no response"
+                print(f"  ✓ Wrote to {char_uuid} ({mode})")
+
+        # Give device time to process command before the caller moves on
+        if ack_event is not None:
+            try:
+                await asyncio.wait_for(ack_event.wait(), timeout=0.2)
+            except asyncio.TimeoutError:
+                pass  # No ack within budget; the write was still queued
+            finally:
+                try:
+                    await client.stop_notify(notify_uuid)
+                except Exception:
+                    pass
+        else:
+            await asyncio.sleep(0.05)
+
+async def write_command(device, service_short: str, char_short: str, payload: bytes, verbose=False, client: Optional[BleakClient] = None):
+    """Send a single payload to a device (BLEDevice or address string);
+    thin wrapper over KSSession."""
+    async with KSSession(device, service_short, char_short, verbose=verbose, client=client) as session:
+        await session.write(payload)
+
+def _parse_args():
+    # Fast path: a bare "on|off [prefix]" invocation is by far the common
+    # case and needs none of argparse's machinery; anything with flags (or
+    # --help) falls through to the full parser.
+    argv = sys.argv[1:]
+    if 1 <= len(argv) <= 2 and argv[0] in ("on", "off") and not any(a.startswith("-") for a in argv[1:]):
+        return SimpleNamespace(
+            action=argv[0],
+            model_prefix=argv[1] if len(argv) == 2 else DEFAULT_PREFIX,
+            address=DEFAULT_ADDRESS,
+            addresses=None,
+            all_ks03=False,
+            timeout=8.0,
+            verbose=False,
+        )
 
-async def main():
     parser = argparse.ArgumentParser(description="Control KS smart LED lights over BLE")
     parser.add_argument("action", choices=["on", "off"], help="Turn lights on or off")
     parser.add_argument("model_prefix", nargs="?", default=DEFAULT_PREFIX, help="Device name prefix (e.g., KS03-, KS04-, KS03~)")
     parser.add_argument("--address", dest="address", default=DEFAULT_ADDRESS, help="BLE MAC/address (skip scan if provided)")
+    parser.add_argument("--addresses", dest="addresses", type=lambda s: s.split(","), help="Comma-separated BLE addresses; skip scanning and send to each concurrently")
     parser.add_argument("--all-ks03", dest="all_ks03", action="store_true", help="Send to all KS03-/KS03~ devices found")
     parser.add_argument("--timeout", type=float, default=8.0, help="Scan timeout seconds")
     parser.add_argument("--verbose", "-v", dest="verbose", action="store_true", help="Verbose output (show services/characteristics)")
-    args = parser.parse_args()
+    return parser.parse_args()
+
+async def main():
+    args = _parse_args()
+    _import_bleak()
 
     if args.model_prefix not in DEVICE_UUIDS:
         known = ", ".join(sorted(DEVICE_UUIDS.keys()))
@@ -165,31 +490,82 @@ async def main():
 
     payload = build_on_off_cmd(args.action == "on")
 
-    if args.all_ks03:
-        targets = await find_all_ks03(timeout=args.timeout)
-        if not targets:
-            raise SystemExit("No KS03 devices found")
-        # Send to each, picking correct UUID mapping by name prefix
-        for addr, name in targets:
-            prefix = "KS03~" if name.startswith("KS03~") else "KS03-"
-            mapping = DEVICE_UUIDS[prefix]
-            try:
-                await write_command(addr, mapping["service"], mapping["write"], payload, verbose=args.verbose)
-                print(f"Sent {args.action.upper()} to {addr} ({name})")
-            except Exception as e:
-                print(f"Failed to send to {addr} ({name}): {e}")
-        return
+    try:
+        if args.addresses:
+            # Known addresses: no scan at all, connect to each concurrently
+            mapping = DEVICE_UUIDS[args.model_prefix]
+            results = await asyncio.gather(
+                *(write_command(addr, mapping["service"], mapping["write"], payload, verbose=args.verbose)
+                  for addr in args.addresses),
+                return_exceptions=True,
+            )
+            for addr, result in zip(args.addresses, results):
+                if isinstance(result, Exception):
+                    print(f"Failed to send to {addr}: {result}")
+                else:
+                    print(f"Sent {args.action.upper()} to {addr} ({args.model_prefix})")
+            return
+
+        if args.all_ks03:
+            targets = await find_all_ks03(timeout=args.timeout)
+            if not targets:
+                raise SystemExit("No KS03 devices found")
+            # Send to all devices concurrently; the scan already resolved each
+            # device's DEVICE_UUIDS key and we keep the BLEDevice for connecting
+            async def send_one(device, prefix):
+                mapping = DEVICE_UUIDS[prefix]
+                await write_command(device, mapping["service"], mapping["write"], payload, verbose=args.verbose)
+            results = await asyncio.gather(
+                *(send_one(device, prefix) for device, prefix in targets),
+                return_exceptions=True,
+            )
+            for (device, prefix), result in zip(targets, results):
+                if isinstance(result, Exception):
+                    print(f"Failed to send to {device.address} ({device.name}): {result}")
+                else:
+                    print(f"Sent {args.action.upper()} to {device.address} ({device.name})")
+            return
 
-    # Single-target behavior
-    mapping = DEVICE_UUIDS[args.model_prefix]
-    address = args.address
-    if not address:
-        address = await find_device_by_prefix(args.model_prefix, timeout=args.timeout)
+        # Single-target behavior: explicit address, then last-known cached
+        # address, then scan as the last resort
+        mapping = DEVICE_UUIDS[args.model_prefix]
+        address = args.address or _load_cache().get("addresses", {}).get(args.model_prefix)
+        from_cache = not args.address and address is not None
+        scanned = False
         if not address:
-            raise SystemExit(f"No device found with name starting '{args.model_prefix}'")
+            # Scan and connect in one overlapped step; write_command reuses
+            # the already-connected client from the cache
+            client = await find_and_connect_by_prefix(args.model_prefix, mapping["service"], timeout=args.timeout)
+            if client is None:
+                raise SystemExit(f"No device found with name starting '{args.model_prefix}'")
+            address = client.address
+            scanned = True
 
-    await write_command(address, mapping["service"], mapping["write"], payload, verbose=args.verbose)
-    print(f"Sent {args.action.upper()} to {address} ({args.model_prefix})")
+        try:
+            await write_command(address, mapping["service"], mapping["write"], payload, verbose=args.verbose)
+        except Exception:
+            if not from_cache:
+                raise
+            # Cached address went stale; fall back to a fresh scan
+            client = await find_and_connect_by_prefix(args.model_prefix, mapping["service"], timeout=args.timeout)
+            if client is None:
+                raise SystemExit(f"No device found with name starting '{args.model_prefix}'")
+            address = client.address
+            scanned = True
+            await write_command(address, mapping["service"], mapping["write"], payload, verbose=args.verbose)
+
+        if scanned:
+            _save_cache(args.model_prefix, address)
+        print(f"Sent {args.action.upper()} to {address} ({args.model_prefix})")
+    finally:
+        await close_cached_clients()
 
 if __name__ == "__main__":
+    try:
+        # uvloop measurably reduces asyncio callback/timer overhead for BLE
+        # workloads; silently fall back to the stdlib loop (e.g. on Windows)
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
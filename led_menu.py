@@ -18,7 +18,9 @@ Requirements:
 import asyncio
 import json
 import os
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 try:
@@ -39,6 +41,20 @@ DEVICE_MAPPINGS = {
     "KS02-": {"service": "AE00", "write": "AE01", "type": "ceiling"},
 }
 
+# Substitute the short UUIDs into the template once at import, so the send
+# path never rebuilds (and bleak never revalidates) the same 36-char strings
+for _entry in DEVICE_MAPPINGS.values():
+    _entry["service_uuid"] = UUID_TEMPLATE % _entry["service"]
+    _entry["write_uuid"] = UUID_TEMPLATE % _entry["write"]
+
+# Tuple form lets str.startswith test every prefix in one C-level call
+_PREFIX_TUPLE = tuple(DEVICE_MAPPINGS.keys())
+
+# Every service UUID advertised by supported models; handed to the scanner
+# so the platform BLE stack drops non-KS advertisements before they cross
+# into Python (a BlueZ SetDiscoveryFilter on Linux)
+_KS_SERVICE_UUIDS = sorted({m["service_uuid"] for m in DEVICE_MAPPINGS.values()})
+
 # Presets file
 PRESETS_FILE = Path.home() / ".ks_led_presets.json"
 DEVICES_FILE = Path.home() / ".ks_led_devices.json"
@@ -74,45 +90,113 @@ class Colors:
     GRAY = "\033[90m"
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def rgb(r, g, b):
-        """Return RGB color escape code."""
+        """Return RGB color escape code (memoized; colours repeat heavily)."""
         return f"\033[38;2;{r};{g};{b}m"
 
+def _attach_preset_cmds(preset):
+    """Precompute both device-type payloads and the preview escape for a preset.
+
+    The commands and the ANSI colour code are pure functions of r/g/b, so
+    building them once when a preset is loaded or created keeps formatting
+    off the send and redraw paths.
+    """
+    r, g, b = preset['r'], preset['g'], preset['b']
+    preset['cmd_ceiling'] = build_color_cmd(r, g, b, "ceiling")
+    preset['cmd_floor'] = build_color_cmd(r, g, b, "floor")
+    preset['_ansi'] = Colors.rgb(r, g, b)
+    return preset
+
+# In-memory caches keyed on file mtime: the files only change through this
+# process, so menu iterations shouldn't re-open and re-parse them each time
+_presets_cache = {"mtime": None, "data": None}
+_devices_cache = {"mtime": None, "data": None}
+
+def _file_mtime(path):
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+# orjson encodes a few times faster than the stdlib; fall back quietly since
+# it is not a hard requirement
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, indent=2).encode()
+
+def _atomic_write(path, obj):
+    """Serialize obj to path via a temp file + rename so a crash mid-save
+    never leaves a truncated JSON file behind."""
+    tmp = path.with_suffix('.tmp')
+    tmp.write_bytes(_dumps(obj))
+    os.replace(tmp, path)
+
 def load_presets():
-    """Load presets from file or return defaults."""
-    if PRESETS_FILE.exists():
+    """Load presets (cached on file mtime), with payloads precomputed."""
+    mtime = _file_mtime(PRESETS_FILE)
+    if _presets_cache["data"] is not None and _presets_cache["mtime"] == mtime:
+        return _presets_cache["data"]
+
+    data = None
+    if mtime is not None:
         try:
             with open(PRESETS_FILE, 'r') as f:
-                return json.load(f)
+                presets = json.load(f)
+            # Attaching validates the shape too: a file that parses but
+            # lacks r/g/b dicts falls back to defaults rather than raising
+            data = {name: _attach_preset_cmds(dict(rgb)) for name, rgb in presets.items()}
         except Exception:
-            pass
-    return DEFAULT_PRESETS.copy()
+            data = None
+    if data is None:
+        data = {name: _attach_preset_cmds(dict(rgb)) for name, rgb in DEFAULT_PRESETS.items()}
+    _presets_cache["mtime"] = mtime
+    _presets_cache["data"] = data
+    return data
 
 def save_presets(presets):
-    """Save presets to file."""
+    """Save presets to file (r/g/b only; derived payloads rebuild on load)."""
     try:
-        with open(PRESETS_FILE, 'w') as f:
-            json.dump(presets, f, indent=2)
+        clean = {name: {'r': rgb['r'], 'g': rgb['g'], 'b': rgb['b']} for name, rgb in presets.items()}
+        _atomic_write(PRESETS_FILE, clean)
     except Exception as e:
         print(f"⚠️  Could not save presets: {e}")
+        return
+    # Refresh the cache in place so the next load is a pure dict return
+    _presets_cache["mtime"] = _file_mtime(PRESETS_FILE)
+    _presets_cache["data"] = {name: _attach_preset_cmds(dict(rgb)) for name, rgb in clean.items()}
 
 def load_devices():
-    """Load device nicknames from file."""
-    if DEVICES_FILE.exists():
+    """Load device nicknames from file (cached on file mtime)."""
+    mtime = _file_mtime(DEVICES_FILE)
+    if _devices_cache["data"] is not None and _devices_cache["mtime"] == mtime:
+        return _devices_cache["data"]
+
+    data = {}
+    if mtime is not None:
         try:
             with open(DEVICES_FILE, 'r') as f:
-                return json.load(f)
+                data = json.load(f)
         except Exception:
             pass
-    return {}
+    _devices_cache["mtime"] = mtime
+    _devices_cache["data"] = data
+    return data
 
 def save_devices(devices_dict):
     """Save device nicknames to file."""
     try:
-        with open(DEVICES_FILE, 'w') as f:
-            json.dump(devices_dict, f, indent=2)
+        _atomic_write(DEVICES_FILE, devices_dict)
     except Exception as e:
         print(f"⚠️  Could not save devices: {e}")
+        return
+    _devices_cache["mtime"] = _file_mtime(DEVICES_FILE)
+    _devices_cache["data"] = devices_dict
 
 def get_device_display_name(addr, name, nicknames):
     """Get display name for device (nickname if available, else real name)."""
@@ -120,130 +204,192 @@ def get_device_display_name(addr, name, nicknames):
         return f"{nicknames[addr]} ({name})"
     return name
 
+# ON/OFF payloads (from CmdFloor.getTopOn), parsed once at import
+_CMD_ON = bytes.fromhex("5BF001B5")
+_CMD_OFF = bytes.fromhex("5B0F01B5")
+
 def build_on_off_cmd(is_on: bool) -> bytes:
-    """Build ON/OFF command (from CmdFloor.getTopOn)."""
-    return bytes.fromhex("5BF001B5" if is_on else "5B0F01B5")
+    """Return the ON/OFF command payload."""
+    return _CMD_ON if is_on else _CMD_OFF
 
 def build_color_cmd(r: int, g: int, b: int, device_type: str = "ceiling", brightness: int = 255) -> bytes:
     """
     Build RGB color command for KS LED devices.
-    
+
     Args:
         r: Red value (0-255)
         g: Green value (0-255)
         b: Blue value (0-255)
         device_type: "ceiling" or "floor" lamp type
         brightness: Brightness value (0-255)
-    
+
     Returns:
         Bytes command to send to device
-    
+
     Command formats:
         Ceiling: 7E070503RRGGBB00EF
         Floor:   5A0001RRGGBB00BB00A5 (with brightness control)
     """
+    # The values are already integers, so assemble the bytes directly
+    # instead of round-tripping through a hex string
     if device_type == "floor":
-        rgb_hex = f"{r:02X}{g:02X}{b:02X}"
-        brightness_hex = f"{brightness:02X}"
-        cmd_str = f"5A0001{rgb_hex}00{brightness_hex}00A5"
-    else:
-        rgb_hex = f"{r:02X}{g:02X}{b:02X}"
-        cmd_str = f"7E070503{rgb_hex}00EF"
-    
-    return bytes.fromhex(cmd_str)
+        return bytes((0x5A, 0x00, 0x01, r, g, b, 0x00, brightness, 0x00, 0xA5))
+    return bytes((0x7E, 0x07, 0x05, 0x03, r, g, b, 0x00, 0xEF))
 
-async def scan_devices(timeout=8.0):
-    """Scan for KS devices and return list of (address, name, prefix)."""
-    devices = []
-    found = await BleakScanner.discover(timeout=timeout)
-    
-    for dev in found:
+def build_brightness_cmd(brightness: int) -> bytes:
+    """Build white-mode brightness command for floor lamps (5A000200000000BB00A5)."""
+    return bytes((0x5A, 0x00, 0x02, 0x00, 0x00, 0x00, 0x00, brightness, 0x00, 0xA5))
+
+# Pre-built floor-lamp brightness payloads for the fixed menu levels
+_BRIGHTNESS_CMDS = {level: build_brightness_cmd(level) for level in (64, 128, 192, 255)}
+
+# The shared scanner is built once, so its detection callback dispatches to
+# whichever scan_devices call is currently collecting results
+_scan_state = {"callback": None}
+
+def _dispatch_detection(dev, adv):
+    cb = _scan_state["callback"]
+    if cb is not None:
+        cb(dev, adv)
+
+async def scan_devices(scanner, timeout=8.0, min_dwell=1.0):
+    """Scan for KS devices and return list of (BLEDevice, name, prefix).
+
+    The BLEDevice object is kept (rather than just its address) so
+    BleakClient can connect to it directly without a second scan. The
+    scanner is shared across rescans: spinning up a fresh one each time
+    causes DBus registration churn (org.bluez.Error.InProgress) on BlueZ.
+
+    Rather than always waiting out the full timeout, the scan ends
+    min_dwell seconds after the first KS device is seen - long enough for
+    nearby siblings to be enumerated, typically well under the timeout.
+    """
+    found = {}
+    first_seen = asyncio.Event()
+
+    def _on_detect(dev, _adv):
         name = dev.name or ""
-        for prefix in DEVICE_MAPPINGS.keys():
-            if name.startswith(prefix):
-                devices.append((dev.address, name, prefix))
-                break
-    
-    return devices
+        if dev.address not in found and name.startswith(_PREFIX_TUPLE):
+            prefix = next(p for p in _PREFIX_TUPLE if name.startswith(p))
+            found[dev.address] = (dev, name, prefix)
+            first_seen.set()
 
-async def write_command(address: str, service_short: str, char_short: str, payload: bytes):
-    """Write command to BLE device."""
-    service_uuid = UUID_TEMPLATE % service_short
-    char_uuid = UUID_TEMPLATE % char_short
-    
-    client = BleakClient(address)
+    _scan_state["callback"] = _on_detect
+    await scanner.start()
     try:
-        await client.connect()
-        if not client.is_connected:
-            raise RuntimeError("Failed to connect")
-        
-        await asyncio.sleep(0.3)
-        
-        # Try write without response first (preferred for KS devices)
-        try:
-            await client.write_gatt_char(char_uuid, payload, response=False)
-        except Exception:
-            # Fallback to write with response
-            await client.write_gatt_char(char_uuid, payload, response=True)
-        
-        await asyncio.sleep(0.2)
+        await asyncio.wait_for(first_seen.wait(), timeout)
+        await asyncio.sleep(min_dwell)
+    except asyncio.TimeoutError:
+        pass  # Nothing advertised within the window
     finally:
-        if client.is_connected:
-            try:
-                await client.disconnect()
-            except Exception:
-                pass
+        await scanner.stop()
+        _scan_state["callback"] = None
+
+    return list(found.values())
 
 def clear_screen():
-    """Clear terminal screen."""
-    os.system('clear' if os.name != 'nt' else 'cls')
+    """Clear terminal screen without forking a shell."""
+    if os.name != 'nt':
+        sys.stdout.write('\x1b[H\x1b[2J')
+        sys.stdout.flush()
+    else:
+        os.system('cls')
+
+# Constant screen blocks, assembled once at import; the Colors.* codes are
+# immutable so each redraw is a single write of a prebuilt string
+_HEADER = (
+    f"\n{Colors.BOLD}{Colors.CYAN}╔═══════════════════════════════════════════╗{Colors.RESET}\n"
+    f"{Colors.BOLD}{Colors.CYAN}║     💡 KS Smart LED Control Menu 💡       ║{Colors.RESET}\n"
+    f"{Colors.BOLD}{Colors.CYAN}╚═══════════════════════════════════════════╝{Colors.RESET}\n\n"
+)
+
+_MENU_TEMPLATE = (
+    f"{Colors.BOLD}Main Menu:{Colors.RESET}\n\n"
+    f"  {Colors.YELLOW}1{Colors.RESET}. Turn ON\n"
+    f"  {Colors.YELLOW}2{Colors.RESET}. Turn OFF\n"
+    f"  {Colors.YELLOW}3{Colors.RESET}. Color Presets\n"
+    f"  {Colors.YELLOW}4{Colors.RESET}. Custom RGB Color\n"
+    f"  {Colors.YELLOW}5{Colors.RESET}. Brightness Control\n"
+    f"  {Colors.YELLOW}6{Colors.RESET}. Manage Presets\n"
+    f"  {Colors.YELLOW}7{Colors.RESET}. Set Device Nickname\n"
+    f"  {Colors.YELLOW}8{Colors.RESET}. Change Device\n"
+    f"  {Colors.RED}q{Colors.RESET}. Quit\n\n"
+)
+
+_BRIGHTNESS_MENU = (
+    f"{Colors.BOLD}Brightness Control{Colors.RESET}\n\n"
+    f"{Colors.DIM}Enter brightness (0-255, or use presets){Colors.RESET}\n\n"
+    f"  {Colors.YELLOW}1{Colors.RESET}. 25% (64)\n"
+    f"  {Colors.YELLOW}2{Colors.RESET}. 50% (128)\n"
+    f"  {Colors.YELLOW}3{Colors.RESET}. 75% (192)\n"
+    f"  {Colors.YELLOW}4{Colors.RESET}. 100% (255)\n"
+    f"  {Colors.YELLOW}5{Colors.RESET}. Custom value\n"
+    f"  {Colors.GRAY}0{Colors.RESET}. Back to main menu\n\n"
+)
+
+_MANAGE_PRESETS_MENU = (
+    f"{Colors.BOLD}Manage Presets{Colors.RESET}\n\n"
+    f"  {Colors.YELLOW}1{Colors.RESET}. Add new preset\n"
+    f"  {Colors.YELLOW}2{Colors.RESET}. Delete preset\n"
+    f"  {Colors.YELLOW}3{Colors.RESET}. Reset to defaults\n"
+    f"  {Colors.GRAY}0{Colors.RESET}. Back to main menu\n\n"
+)
 
 def print_header():
     """Print fancy header."""
     clear_screen()
-    print(f"\n{Colors.BOLD}{Colors.CYAN}╔═══════════════════════════════════════════╗{Colors.RESET}")
-    print(f"{Colors.BOLD}{Colors.CYAN}║     💡 KS Smart LED Control Menu 💡       ║{Colors.RESET}")
-    print(f"{Colors.BOLD}{Colors.CYAN}╚═══════════════════════════════════════════╝{Colors.RESET}\n")
+    sys.stdout.write(_HEADER)
 
 def print_device_list(devices, selected_idx, nicknames=None):
     """Print device list with selection."""
     if nicknames is None:
         nicknames = {}
-    print(f"{Colors.BOLD}Available Devices:{Colors.RESET}\n")
-    for i, (addr, name, prefix) in enumerate(devices):
+    lines = [f"{Colors.BOLD}Available Devices:{Colors.RESET}\n"]
+    for i, (dev, name, prefix) in enumerate(devices):
         marker = f"{Colors.GREEN}►{Colors.RESET}" if i == selected_idx else " "
         color = Colors.GREEN if i == selected_idx else Colors.GRAY
-        display_name = get_device_display_name(addr, name, nicknames)
-        print(f"  {marker} {color}{i+1}. {display_name} ({addr}){Colors.RESET}")
-    print()
+        display_name = get_device_display_name(dev.address, name, nicknames)
+        lines.append(f"  {marker} {color}{i+1}. {display_name} ({dev.address}){Colors.RESET}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def print_menu(device_name):
     """Print main menu options."""
-    print(f"{Colors.DIM}Device: {Colors.BOLD}{device_name}{Colors.RESET}\n")
-    print(f"{Colors.BOLD}Main Menu:{Colors.RESET}\n")
-    print(f"  {Colors.YELLOW}1{Colors.RESET}. Turn ON")
-    print(f"  {Colors.YELLOW}2{Colors.RESET}. Turn OFF")
-    print(f"  {Colors.YELLOW}3{Colors.RESET}. Color Presets")
-    print(f"  {Colors.YELLOW}4{Colors.RESET}. Custom RGB Color")
-    print(f"  {Colors.YELLOW}5{Colors.RESET}. Brightness Control")
-    print(f"  {Colors.YELLOW}6{Colors.RESET}. Manage Presets")
-    print(f"  {Colors.YELLOW}7{Colors.RESET}. Set Device Nickname")
-    print(f"  {Colors.YELLOW}8{Colors.RESET}. Change Device")
-    print(f"  {Colors.RED}q{Colors.RESET}. Quit")
-    print()
-
-def print_presets(presets):
-    """Print color presets with preview."""
-    print(f"\n{Colors.BOLD}Color Presets:{Colors.RESET}\n")
-    
-    items = list(presets.items())
+    sys.stdout.write(
+        f"{Colors.DIM}Device: {Colors.BOLD}{device_name}{Colors.RESET}\n\n" + _MENU_TEMPLATE)
+
+def print_presets(items):
+    """Print color presets with preview.
+
+    Takes a pre-built list of (name, rgb) pairs so callers that loop over
+    redraws materialize the dict once, not per keystroke.
+    """
+    lines = [f"\n{Colors.BOLD}Color Presets:{Colors.RESET}\n"]
+
     for i, (name, rgb) in enumerate(items, 1):
         r, g, b = rgb['r'], rgb['g'], rgb['b']
-        color_preview = Colors.rgb(r, g, b)
-        print(f"  {Colors.YELLOW}{i:2d}{Colors.RESET}. {color_preview}█████{Colors.RESET} {name} (R:{r} G:{g} B:{b})")
-    
-    print(f"\n  {Colors.GRAY}0{Colors.RESET}. Back to main menu")
-    print()
+        color_preview = rgb.get('_ansi') or Colors.rgb(r, g, b)
+        lines.append(f"  {Colors.YELLOW}{i:2d}{Colors.RESET}. {color_preview}█████{Colors.RESET} {name} (R:{r} G:{g} B:{b})")
+
+    lines.append(f"\n  {Colors.GRAY}0{Colors.RESET}. Back to main menu")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _parse_rgb(line):
+    """Parse a single 'r g b', 'r,g,b' or '#RRGGBB' line into an (r, g, b) tuple.
+
+    Raises ValueError for anything else; range checks stay with the callers.
+    """
+    line = line.strip()
+    if line.startswith('#'):
+        if len(line) != 7:
+            raise ValueError(f"bad hex colour: {line!r}")
+        return tuple(bytes.fromhex(line[1:]))
+    parts = re.split(r"[,\s]+", line)
+    if len(parts) != 3:
+        raise ValueError(f"expected three values: {line!r}")
+    r, g, b = map(int, parts)
+    return r, g, b
 
 def get_input(prompt, valid_choices=None):
     """Get user input with optional validation."""
@@ -253,65 +399,50 @@ def get_input(prompt, valid_choices=None):
             return choice
         print(f"{Colors.RED}Invalid choice. Try again.{Colors.RESET}")
 
-async def send_command(device, payload, action_name, is_color=False):
-    """Send command to device with visual feedback."""
-    addr, name, prefix = device
-    mapping = DEVICE_MAPPINGS[prefix]
-    
+async def send_command(client, device, payload, action_name, is_color=False):
+    """Send command over the already-connected client with visual feedback."""
+    dev, name, prefix, device_type = device
+    char_uuid = DEVICE_MAPPINGS[prefix]["write_uuid"]
+
     print(f"\n{Colors.BLUE}⏳ Sending {action_name}...{Colors.RESET}")
-    
+
     try:
         if is_color:
-            # For color commands, keep connection open for ON + color sequence
-            char_uuid = UUID_TEMPLATE % mapping["write"]
-            
-            client = BleakClient(addr)
-            await client.connect()
-            await asyncio.sleep(0.3)
-            
-            # Send ON command first
-            on_cmd = build_on_off_cmd(True)
-            await client.write_gatt_char(char_uuid, on_cmd, response=False)
-            await asyncio.sleep(0.5)
-            
-            # Send color command on same connection
-            await client.write_gatt_char(char_uuid, payload, response=False)
-            await asyncio.sleep(0.2)
-            
-            await client.disconnect()
-        else:
-            # Regular commands use standard write
-            await write_command(addr, mapping["service"], mapping["write"], payload)
-        
+            # Make sure the device is on before applying the color. Both are
+            # write-without-response commands - submitted back-to-back with
+            # no sleep in between, the stack queues them in order without
+            # waiting for the ON to hit the air first.
+            await client.write_gatt_char(char_uuid, _CMD_ON, response=False)
+        await client.write_gatt_char(char_uuid, payload, response=False)
+
         print(f"{Colors.GREEN}✓ {action_name} sent successfully!{Colors.RESET}")
     except Exception as e:
         print(f"{Colors.RED}✗ Failed: {e}{Colors.RESET}")
-    
-    await asyncio.sleep(1)
 
-async def color_preset_menu(device, presets):
+    # Brief pause so the feedback line is readable before the menu redraws
+    await asyncio.sleep(0.3)
+
+async def color_preset_menu(client, device, presets):
     """Handle color preset selection."""
-    addr, name, prefix = device
-    mapping = DEVICE_MAPPINGS[prefix]
-    device_type = mapping.get("type", "ceiling")
-    
+    dev, name, prefix, device_type = device
+    items = list(presets.items())
+
     while True:
         print_header()
-        print_presets(presets)
-        
+        print_presets(items)
+
         choice = get_input("Select preset (number or 0 to go back): ")
-        
+
         if choice == '0':
             break
-        
+
         try:
             idx = int(choice) - 1
-            items = list(presets.items())
             if 0 <= idx < len(items):
                 name, rgb = items[idx]
-                r, g, b = rgb['r'], rgb['g'], rgb['b']
-                cmd = build_color_cmd(r, g, b, device_type)
-                await send_command(device, cmd, f"{name} color", is_color=True)
+                # Payload was precomputed when the preset was loaded
+                cmd = rgb[f"cmd_{device_type}"]
+                await send_command(client, device, cmd, f"{name} color", is_color=True)
             else:
                 print(f"{Colors.RED}Invalid preset number{Colors.RESET}")
                 await asyncio.sleep(1)
@@ -319,21 +450,18 @@ async def color_preset_menu(device, presets):
             print(f"{Colors.RED}Please enter a number{Colors.RESET}")
             await asyncio.sleep(1)
 
-async def custom_color_menu(device):
+async def custom_color_menu(client, device):
     """Handle custom RGB color input."""
-    addr, name, prefix = device
-    mapping = DEVICE_MAPPINGS[prefix]
-    device_type = mapping.get("type", "ceiling")
-    
+    dev, name, prefix, device_type = device
+
+
     print_header()
     print(f"{Colors.BOLD}Custom RGB Color{Colors.RESET}\n")
-    print(f"{Colors.DIM}Enter RGB values (0-255){Colors.RESET}\n")
-    
+    print(f"{Colors.DIM}Enter RGB values 0-255 on one line, or a #RRGGBB hex code{Colors.RESET}\n")
+
     try:
-        r = int(input(f"{Colors.RED}Red (0-255): {Colors.RESET}").strip())
-        g = int(input(f"{Colors.GREEN}Green (0-255): {Colors.RESET}").strip())
-        b = int(input(f"{Colors.BLUE}Blue (0-255): {Colors.RESET}").strip())
-        
+        r, g, b = _parse_rgb(input(f"{Colors.BOLD}RGB (r g b or #RRGGBB): {Colors.RESET}"))
+
         if not all(0 <= x <= 255 for x in (r, g, b)):
             print(f"{Colors.RED}Values must be between 0-255{Colors.RESET}")
             await asyncio.sleep(2)
@@ -346,7 +474,7 @@ async def custom_color_menu(device):
         confirm = get_input("Send this color? (y/n): ", ['y', 'n', 'yes', 'no'])
         if confirm in ['y', 'yes']:
             cmd = build_color_cmd(r, g, b, device_type)
-            await send_command(device, cmd, "custom color", is_color=True)
+            await send_command(client, device, cmd, "custom color", is_color=True)
             
             # Offer to save as preset
             save = get_input("Save as preset? (y/n): ", ['y', 'n', 'yes', 'no'])
@@ -354,33 +482,31 @@ async def custom_color_menu(device):
                 name = input(f"{Colors.BOLD}Preset name: {Colors.RESET}").strip()
                 if name:
                     presets = load_presets()
-                    presets[name] = {"r": r, "g": g, "b": b}
+                    presets[name] = _attach_preset_cmds({"r": r, "g": g, "b": b})
                     save_presets(presets)
                     print(f"{Colors.GREEN}✓ Saved as '{name}'{Colors.RESET}")
                     await asyncio.sleep(1.5)
-    
+
     except ValueError:
-        print(f"{Colors.RED}Invalid number{Colors.RESET}")
+        print(f"{Colors.RED}Invalid RGB input{Colors.RESET}")
         await asyncio.sleep(2)
     except KeyboardInterrupt:
         print()
 
-async def brightness_menu(device):
-    """Handle brightness adjustment."""
-    addr, name, prefix = device
-    mapping = DEVICE_MAPPINGS[prefix]
-    device_type = mapping.get("type", "ceiling")
-    
+async def brightness_menu(client, device):
+    """Handle brightness adjustment (floor lamps only)."""
+    dev, name, prefix, device_type = device
+
+    # Bail out before drawing the whole prompt tree for devices that can't
+    # act on the result
+    if device_type != "floor":
+        print(f"{Colors.YELLOW}⚠️  Brightness control not yet supported for ceiling lights{Colors.RESET}")
+        await asyncio.sleep(1.5)
+        return
+
     print_header()
-    print(f"{Colors.BOLD}Brightness Control{Colors.RESET}\n")
-    print(f"{Colors.DIM}Enter brightness (0-255, or use presets){Colors.RESET}\n")
-    print(f"  {Colors.YELLOW}1{Colors.RESET}. 25% (64)")
-    print(f"  {Colors.YELLOW}2{Colors.RESET}. 50% (128)")
-    print(f"  {Colors.YELLOW}3{Colors.RESET}. 75% (192)")
-    print(f"  {Colors.YELLOW}4{Colors.RESET}. 100% (255)")
-    print(f"  {Colors.YELLOW}5{Colors.RESET}. Custom value")
-    print(f"  {Colors.GRAY}0{Colors.RESET}. Back to main menu\n")
-    
+    sys.stdout.write(_BRIGHTNESS_MENU)
+
     choice = get_input("Choose option: ").strip()
     
     if choice == '0':
@@ -408,15 +534,9 @@ async def brightness_menu(device):
             return
     
     if brightness is not None:
-        if device_type == "floor":
-            # White mode format for floor lamps
-            brightness_hex = f"{brightness:02X}"
-            cmd_str = f"5A000200000000{brightness_hex}00A5"
-            cmd = bytes.fromhex(cmd_str)
-            await send_command(device, cmd, f"brightness {brightness}", is_color=True)
-        else:
-            print(f"{Colors.YELLOW}⚠️  Brightness control not yet supported for ceiling lights{Colors.RESET}")
-            await asyncio.sleep(2)
+        # White mode format for floor lamps; fixed levels are pre-built
+        cmd = _BRIGHTNESS_CMDS.get(brightness) or build_brightness_cmd(brightness)
+        await send_command(client, device, cmd, f"brightness {brightness}", is_color=True)
 
 async def manage_presets_menu():
     """Manage presets (add/delete)."""
@@ -424,12 +544,8 @@ async def manage_presets_menu():
     
     while True:
         print_header()
-        print(f"{Colors.BOLD}Manage Presets{Colors.RESET}\n")
-        print(f"  {Colors.YELLOW}1{Colors.RESET}. Add new preset")
-        print(f"  {Colors.YELLOW}2{Colors.RESET}. Delete preset")
-        print(f"  {Colors.YELLOW}3{Colors.RESET}. Reset to defaults")
-        print(f"  {Colors.GRAY}0{Colors.RESET}. Back to main menu\n")
-        
+        sys.stdout.write(_MANAGE_PRESETS_MENU)
+
         choice = get_input("Choose option: ")
         
         if choice == '0':
@@ -442,30 +558,28 @@ async def manage_presets_menu():
                 continue
             
             try:
-                r = int(input(f"{Colors.RED}Red (0-255): {Colors.RESET}").strip())
-                g = int(input(f"{Colors.GREEN}Green (0-255): {Colors.RESET}").strip())
-                b = int(input(f"{Colors.BLUE}Blue (0-255): {Colors.RESET}").strip())
-                
+                r, g, b = _parse_rgb(input(f"{Colors.BOLD}RGB (r g b or #RRGGBB): {Colors.RESET}"))
+
                 if all(0 <= x <= 255 for x in (r, g, b)):
-                    presets[name] = {"r": r, "g": g, "b": b}
+                    presets[name] = _attach_preset_cmds({"r": r, "g": g, "b": b})
                     save_presets(presets)
                     print(f"{Colors.GREEN}✓ Preset '{name}' added{Colors.RESET}")
                 else:
                     print(f"{Colors.RED}Invalid values{Colors.RESET}")
             except ValueError:
-                print(f"{Colors.RED}Invalid number{Colors.RESET}")
+                print(f"{Colors.RED}Invalid RGB input{Colors.RESET}")
             
             await asyncio.sleep(1.5)
         
         elif choice == '2':
             # Delete preset
-            print_presets(presets)
+            items = list(presets.items())
+            print_presets(items)
             try:
                 idx = int(get_input("\nDelete preset number (0 to cancel): "))
                 if idx > 0:
-                    items = list(presets.keys())
                     if 0 < idx <= len(items):
-                        name = items[idx - 1]
+                        name = items[idx - 1][0]
                         confirm = get_input(f"Delete '{name}'? (y/n): ", ['y', 'n'])
                         if confirm == 'y':
                             del presets[name]
@@ -486,7 +600,8 @@ async def manage_presets_menu():
 
 async def set_device_nickname(device):
     """Set or update device nickname."""
-    addr, name, prefix = device
+    dev, name, prefix, device_type = device
+    addr = dev.address
     nicknames = load_devices()
     
     print_header()
@@ -513,86 +628,129 @@ async def set_device_nickname(device):
     
     await asyncio.sleep(1.5)
 
-async def main():
-    """Main interactive menu loop."""
-    print_header()
-    print(f"{Colors.BLUE}🔍 Scanning for KS devices...{Colors.RESET}")
-    print(f"{Colors.DIM}This may take a few seconds...{Colors.RESET}\n")
-    
-    devices = await scan_devices(timeout=8.0)
-    
+def _with_type(entry):
+    """Expand a scan tuple to (BLEDevice, name, prefix, device_type).
+
+    Resolving the type once at selection time saves every menu from doing
+    its own DEVICE_MAPPINGS lookup.
+    """
+    dev, name, prefix = entry
+    return dev, name, prefix, DEVICE_MAPPINGS[prefix].get("type", "ceiling")
+
+async def select_device(scanner, devices=None):
+    """Scan (if needed) and let the user pick a device.
+
+    Returns a (BLEDevice, name, prefix, device_type) tuple, or None to quit.
+    """
+    if devices is None:
+        print_header()
+        print(f"{Colors.BLUE}🔍 Scanning for KS devices...{Colors.RESET}")
+        print(f"{Colors.DIM}This may take a few seconds...{Colors.RESET}\n")
+        devices = await scan_devices(scanner, timeout=8.0)
+
     if not devices:
         print(f"{Colors.RED}No KS devices found.{Colors.RESET}")
         print(f"{Colors.DIM}Make sure Bluetooth is enabled and devices are powered on.{Colors.RESET}")
-        return
-    
-    # Device selection
+        return None
+
     selected_idx = 0
     nicknames = load_devices()
     while True:
         print_header()
         print_device_list(devices, selected_idx, nicknames)
-        
+
         print(f"{Colors.DIM}Use number to select, Enter to confirm, 'r' to rescan, 'q' to quit{Colors.RESET}")
         choice = get_input("> ").strip().lower()
-        
+
         if choice == 'q':
-            return
+            return None
         elif choice == 'r':
             print(f"\n{Colors.BLUE}🔍 Rescanning...{Colors.RESET}")
-            devices = await scan_devices(timeout=8.0)
+            devices = await scan_devices(scanner, timeout=8.0)
             if not devices:
                 print(f"{Colors.RED}No devices found{Colors.RESET}")
                 await asyncio.sleep(2)
-                return
+                return None
             selected_idx = 0
         elif choice == '':
-            break
+            return _with_type(devices[selected_idx])
         elif choice.isdigit():
             idx = int(choice) - 1
             if 0 <= idx < len(devices):
-                selected_idx = idx
-                break  # Confirm selection immediately
-    
-    device = devices[selected_idx]
-    addr, name, prefix = device
-    
-    # Main menu loop
-    presets = load_presets()
-    nicknames = load_devices()
-    
+                return _with_type(devices[idx])  # Confirm selection immediately
+
+async def main():
+    """Main interactive menu loop."""
+    # One scanner instance for the whole session (see scan_devices), with
+    # the KS service UUIDs filtered at the driver level
+    scanner = BleakScanner(_dispatch_detection, service_uuids=_KS_SERVICE_UUIDS)
+
     while True:
-        nicknames = load_devices()  # Reload in case of changes
-        display_name = get_device_display_name(addr, name, nicknames)
-        print_header()
-        print_menu(display_name)
-        
-        choice = get_input("Choose option: ").strip().lower()
-        
-        if choice == 'q':
-            print(f"\n{Colors.CYAN}Goodbye! 👋{Colors.RESET}\n")
-            break
-        elif choice == '1':
-            cmd = build_on_off_cmd(True)
-            await send_command(device, cmd, "ON")
-        elif choice == '2':
-            cmd = build_on_off_cmd(False)
-            await send_command(device, cmd, "OFF")
-        elif choice == '3':
-            await color_preset_menu(device, presets)
-            presets = load_presets()  # Reload in case of changes
-        elif choice == '4':
-            await custom_color_menu(device)
-        elif choice == '5':
-            await brightness_menu(device)
-        elif choice == '6':
-            await manage_presets_menu()
-            presets = load_presets()
-        elif choice == '7':
-            await set_device_nickname(device)
-        elif choice == '8':
-            # Change device - restart selection
-            return await main()
+        device = await select_device(scanner)
+        if device is None:
+            return
+        dev, name, prefix, device_type = device
+
+        # Main menu loop: one connection held open for the whole session, so
+        # every command is a sub-100ms write instead of a fresh connect cycle
+        presets = load_presets()
+        change_device = False
+
+        print(f"\n{Colors.BLUE}🔗 Connecting to {name}...{Colors.RESET}")
+        # Connect with the BLEDevice from the scan; passing a bare address
+        # would make bleak run a second discovery to resolve it
+        client = BleakClient(dev)
+        try:
+            await client.connect()
+        except Exception as e:
+            # Routine BLE failure (device asleep, out of range, connection
+            # refused) - report it and go back to selection
+            print(f"{Colors.RED}✗ Failed: {e}{Colors.RESET}")
+            await asyncio.sleep(2)
+            continue
+
+        try:
+            while True:
+                nicknames = load_devices()
+                display_name = get_device_display_name(dev.address, name, nicknames)
+                print_header()
+                print_menu(display_name)
+
+                choice = get_input("Choose option: ").strip().lower()
+
+                if choice == 'q':
+                    print(f"\n{Colors.CYAN}Goodbye! 👋{Colors.RESET}\n")
+                    break
+                elif choice == '1':
+                    cmd = build_on_off_cmd(True)
+                    await send_command(client, device, cmd, "ON")
+                elif choice == '2':
+                    cmd = build_on_off_cmd(False)
+                    await send_command(client, device, cmd, "OFF")
+                elif choice == '3':
+                    await color_preset_menu(client, device, presets)
+                    presets = load_presets()
+                elif choice == '4':
+                    await custom_color_menu(client, device)
+                elif choice == '5':
+                    await brightness_menu(client, device)
+                elif choice == '6':
+                    await manage_presets_menu()
+                    presets = load_presets()
+                elif choice == '7':
+                    await set_device_nickname(device)
+                elif choice == '8':
+                    # Change device - back to selection (disconnects first)
+                    change_device = True
+                    break
+        finally:
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+
+        if not change_device:
+            return
 
 if __name__ == "__main__":
     try: